@@ -0,0 +1,101 @@
+import time
+import random
+import numpy as np
+from zombie_env_short import ZombieEnvironment
+from q_learning_agent import QLearningAgent
+
+# Agent variants to compare, all other hyperparameters match train()
+METHODS = {
+    "one-step Q-learning": {},
+    "3-step Q-learning": {"n_step": 3},
+    "Watkins Q(lambda=0.8)": {"trace_decay": 0.8},
+    "prioritized sweeping (20)": {"planning_steps": 20},
+}
+
+def run(agent_kwargs, episodes=2000, max_steps_per_episode=200, seed=0):
+    random.seed(seed)
+    np.random.seed(seed)
+
+    # Headless environment: no window and no per-step delay
+    env = ZombieEnvironment(render_mode=None)
+    agent = QLearningAgent(
+        state_size=(env.grid_size, env.grid_size, 6),
+        action_size=env.action_space.n,
+        learning_rate=0.2,
+        discount_factor=0.99,
+        epsilon=1.0,
+        epsilon_min=0.01,
+        epsilon_decay=0.995,
+        **agent_kwargs
+    )
+
+    returns = []
+    total_steps = 0
+    solved_episode = None
+    solved_steps = None
+    solved_seconds = None
+    start = time.perf_counter()
+
+    for episode in range(episodes):
+        state, _ = env.reset()
+        total_reward = 0
+        steps = 0
+        done = False
+        truncated = False
+
+        while not done and not truncated and steps < max_steps_per_episode:
+            action = agent.choose_action(state)
+            next_state, reward, done, truncated, info = env.step(action)
+            agent.learn(state, action, reward, next_state, done)
+            state = next_state
+            total_reward += reward
+            steps += 1
+
+        agent.end_episode()
+        total_steps += steps
+        returns.append(total_reward)
+
+        # Same "solved" criterion as train(), but keep running so every method gets the same budget
+        if solved_episode is None and total_reward > 5000:
+            solved_episode = episode
+            solved_steps = total_steps
+            solved_seconds = time.perf_counter() - start
+
+    env.close()
+    return {
+        "returns": np.array(returns),
+        "solved_episode": solved_episode,
+        "solved_steps": solved_steps,
+        "solved_seconds": solved_seconds,
+        "seconds": time.perf_counter() - start,
+    }
+
+def first_episode_above(returns, threshold):
+    hits = np.flatnonzero(returns > threshold)
+    return hits[0] + 1 if len(hits) else float('nan')
+
+def mean_or_nan(values):
+    values = [v for v in values if v is not None and not np.isnan(v)]
+    return np.mean(values) if values else float('nan')
+
+def benchmark(episodes=1500, seeds=(0, 1, 2), last_n=100, partial_threshold=2000):
+    # Returns above partial_threshold mean the L100 zombie died, so progress shows even without a full solve
+    print(f"Episodes per run: {episodes}, seeds: {len(seeds)}")
+    print(f"{'Method':<28}{'Solved':>8}{f'Last {last_n}':>10}{'Best':>8}"
+          f"{f'Ep>{partial_threshold}':>9}{'Ep>5000':>9}{'Steps>5000':>11}{'Sec>5000':>9}{'Seconds':>9}")
+    for name, agent_kwargs in METHODS.items():
+        results = [run(agent_kwargs, episodes=episodes, seed=seed) for seed in seeds]
+        solved = [r for r in results if r["solved_episode"] is not None]
+        last_mean = np.mean([r["returns"][-last_n:].mean() for r in results])
+        best = np.mean([r["returns"].max() for r in results])
+        partial = mean_or_nan([first_episode_above(r["returns"], partial_threshold) for r in results])
+        # Time-to-solve columns average over the solved seeds only
+        episodes_to_solve = mean_or_nan([r["solved_episode"] + 1 for r in solved])
+        steps_to_solve = mean_or_nan([r["solved_steps"] for r in solved])
+        seconds_to_solve = mean_or_nan([r["solved_seconds"] for r in solved])
+        seconds = np.mean([r["seconds"] for r in results])
+        print(f"{name:<28}{len(solved):>5}/{len(seeds):<2}{last_mean:>10.1f}{best:>8.0f}"
+              f"{partial:>9.1f}{episodes_to_solve:>9.1f}{steps_to_solve:>11.0f}{seconds_to_solve:>9.2f}{seconds:>9.2f}")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,89 @@
+from collections import deque
+
+class ConvergenceTracker:
+    """Tracks learning progress and decides when training can stop.
+
+    Three signals are tracked incrementally:
+    - the max Bellman residual |TD error| over the last `residual_window` updates
+    - the fraction of previously updated states whose greedy action changed between checkpoints
+    - the success rate over the last `success_window` episodes
+
+    Setting a tolerance to None disables that stopping rule. Training stops once
+    every enabled rule holds and at least `min_episodes` episodes have run.
+    """
+
+    def __init__(self, residual_window=1000, residual_tol=1.0,
+                 checkpoint_interval=50, policy_change_tol=0.01, stable_checkpoints=2,
+                 success_window=50, success_rate_tol=0.9, min_episodes=100):
+        self.residual_window = residual_window
+        self.residual_tol = residual_tol
+        self.checkpoint_interval = checkpoint_interval
+        self.policy_change_tol = policy_change_tol
+        self.stable_checkpoints = stable_checkpoints
+        self.success_window = success_window
+        self.success_rate_tol = success_rate_tol
+        self.min_episodes = min_episodes
+
+        # Sliding-window max: residuals plus a monotonically decreasing deque of (index, value)
+        self.updates = 0
+        self.residual_max_queue = deque()
+
+        self.policy_change = None
+        self.stable_count = 0
+
+        self.successes = deque(maxlen=success_window)
+        self.episodes = 0
+
+    def record_update(self, td_error):
+        residual = abs(td_error)
+        while self.residual_max_queue and self.residual_max_queue[-1][1] <= residual:
+            self.residual_max_queue.pop()
+        self.residual_max_queue.append((self.updates, residual))
+        while self.residual_max_queue[0][0] <= self.updates - self.residual_window:
+            self.residual_max_queue.popleft()
+        self.updates += 1
+
+    @property
+    def max_residual(self):
+        if not self.residual_max_queue:
+            return float('inf')
+        return self.residual_max_queue[0][1]
+
+    @property
+    def success_rate(self):
+        if not self.successes:
+            return 0.0
+        return sum(self.successes) / len(self.successes)
+
+    def record_episode(self, success, agent):
+        self.successes.append(bool(success))
+        self.episodes += 1
+        if self.episodes % self.checkpoint_interval == 0:
+            self._checkpoint(*agent.take_policy_changes())
+
+    def _checkpoint(self, changed, compared):
+        # Only states that existed at both checkpoints are compared; new states are not changes
+        if compared > 0:
+            self.policy_change = changed / compared
+            if self.policy_change <= self.policy_change_tol:
+                self.stable_count += 1
+            else:
+                self.stable_count = 0
+
+    def should_stop(self):
+        if self.episodes < self.min_episodes:
+            return False
+        if self.residual_tol is not None and self.max_residual > self.residual_tol:
+            return False
+        if self.policy_change_tol is not None and self.stable_count < self.stable_checkpoints:
+            return False
+        if self.success_rate_tol is not None:
+            if len(self.successes) < self.success_window or self.success_rate < self.success_rate_tol:
+                return False
+        return True
+
+    def summary(self):
+        policy_change = "n/a" if self.policy_change is None else f"{self.policy_change:.3f}"
+        return (f"Max residual: {self.max_residual:.3f}, "
+                f"Policy change: {policy_change}, "
+                f"Success rate: {self.success_rate:.2f}")
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import time
+import numpy as np
+from q_learning_agent import QLearningAgent
+
+# Wire protocol: one JSON object per line in each direction.
+# Request:  {"state_id": 12} or {"state_key": "[(0, 7), ...]"} or {"observation": [[[0, 1, ...]]]}
+# Response: {"action": 3, "state_id": 12} (state_id is -1 for keys/observations missing from the Q-table)
+#           or {"error": "..."} for malformed requests, including out-of-range state ids
+
+def export_policy(q_table, values_file='policy_values.npy', keys_file='policy_keys.npy'):
+    # Flatten the dict Q-table into a dense array that can be memory-mapped, row i <-> keys[i]
+    keys = list(q_table.keys())
+    action_size = len(next(iter(q_table.values()))) if q_table else 1
+    values = np.zeros((len(keys), action_size), dtype=np.float32)
+    for i, key in enumerate(keys):
+        values[i] = q_table[key]
+    np.save(values_file, values)
+    np.save(keys_file, np.array(keys, dtype=str))
+    return values_file, keys_file
+
+class PolicyServer:
+    def __init__(self, values_file='policy_values.npy', keys_file='policy_keys.npy',
+                 max_batch_size=256, max_batch_delay=0.002, grid_size=8):
+        self.q_values = np.load(values_file, mmap_mode='r')
+        self.state_ids = {str(key): i for i, key in enumerate(np.load(keys_file))}
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay  # seconds to wait for more requests to join a batch
+        self.observation_shape = (grid_size, grid_size, 6)
+
+        self.queue = None
+        self.server = None
+        self.batch_task = None
+        self.writers = set()  # open client connections
+
+        # Latency and throughput counters
+        self.requests = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.started_at = None
+
+    def state_id(self, request):
+        if 'state_id' in request:
+            state_id = request['state_id']
+            if isinstance(state_id, bool) or not isinstance(state_id, int):
+                raise ValueError(f"state_id must be an integer, got {state_id!r}")
+            if not 0 <= state_id < len(self.q_values):
+                raise ValueError(f"state_id {state_id} out of range [0, {len(self.q_values)})")
+            return state_id
+        if 'state_key' in request:
+            state_key = request['state_key']
+        else:
+            observation = np.asarray(request['observation'])
+            if observation.shape != self.observation_shape:
+                raise ValueError(f"observation shape {observation.shape} != {self.observation_shape}")
+            state_key = QLearningAgent._get_state_key(observation)
+        return self.state_ids.get(state_key, -1)
+
+    async def act(self, state_id):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((state_id, future, time.perf_counter()))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._fail_batch(batch)
+                raise
+            self._serve_batch(batch)
+
+    def _fail_batch(self, batch):
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(ConnectionError("Policy server closed"))
+
+    def _serve_batch(self, batch):
+        state_ids = np.array([state_id for state_id, _, _ in batch])
+        # Unknown states act like a fresh all-zero Q row, i.e. action 0
+        actions = np.zeros(len(batch), dtype=int)
+        known = state_ids >= 0
+        if known.any():
+            actions[known] = np.argmax(self.q_values[state_ids[known]], axis=1)
+
+        now = time.perf_counter()
+        for (_, future, enqueued_at), action in zip(batch, actions):
+            latency = now - enqueued_at
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if not future.done():
+                future.set_result(int(action))
+        self.requests += len(batch)
+        self.batches += 1
+
+    async def _read_line(self, reader):
+        # Returns one request line, b"" for a line over the stream limit (skipped), or None at EOF
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return e.partial or None
+        except asyncio.LimitOverrunError:
+            pass
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return b""
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return None
+
+    async def _handle_client(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line is None:
+                    break
+                try:
+                    if not line:
+                        raise ValueError("request line too long")
+                    state_id = self.state_id(json.loads(line))
+                except (ValueError, KeyError, TypeError, IndexError, OverflowError) as e:
+                    response = {"error": str(e)}
+                else:
+                    response = {"action": await self.act(state_id), "state_id": state_id}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        # Listens on a Unix socket when path is given, otherwise on localhost TCP (port 0 picks a free port)
+        self.queue = asyncio.Queue()
+        self.batch_task = asyncio.create_task(self._batch_loop())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_client, path=path)
+        else:
+            self.server = await asyncio.start_server(self._handle_client, host, port)
+        self.started_at = time.perf_counter()
+        return self.server
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()
+
+    async def close(self):
+        # Open connections outlive server.close(), so drop them and fail any pending requests
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        self.batch_task.cancel()
+        try:
+            await self.batch_task
+        except asyncio.CancelledError:
+            pass
+        while not self.queue.empty():
+            self._fail_batch([self.queue.get_nowait()])
+        await self.server.wait_closed()
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "mean_latency_ms": 1000 * self.total_latency / self.requests if self.requests else 0.0,
+            "max_latency_ms": 1000 * self.max_latency,
+            "requests_per_second": self.requests / elapsed if elapsed > 0 else 0.0,
+        }
+
+class PolicyClient:
+    async def connect(self, host='127.0.0.1', port=None, path=None):
+        if path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(host, port)
+        return self
+
+    async def request(self, **request):
+        self.writer.write((json.dumps(request) + "\n").encode())
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Policy server closed the connection")
+        return json.loads(line)
+
+    async def act(self, state_id=None, state_key=None, observation=None):
+        if state_id is not None:
+            response = await self.request(state_id=state_id)
+        elif state_key is not None:
+            response = await self.request(state_key=state_key)
+        else:
+            response = await self.request(observation=np.asarray(observation).tolist())
+        if "error" in response:
+            raise ValueError(response["error"])
+        if response["state_id"] == -1:
+            raise LookupError("State is not in the served Q-table")
+        return response["action"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def connect_local(server):
+    # Unix socket servers report their path, TCP servers a (host, port, ...) tuple
+    address = server.address
+    if isinstance(address, str):
+        return await PolicyClient().connect(path=address)
+    return await PolicyClient().connect(address[0], address[1])
+
+async def run_local_clients(server, clients=32, requests_per_client=100):
+    # Stand-in game sessions: each client asks for actions on random known states
+    state_count = len(server.q_values)
+
+    async def session(seed):
+        rng = np.random.default_rng(seed)
+        client = await connect_local(server)
+        for _ in range(requests_per_client if state_count else 0):
+            await client.act(state_id=int(rng.integers(state_count)))
+        await client.close()
+
+    await asyncio.gather(*(session(seed) for seed in range(clients)))
+    return server.stats()
+
+async def main(q_table_file='q_table.npy'):
+    export_policy(np.load(q_table_file, allow_pickle=True).item())
+    server = PolicyServer()
+    await server.start()
+    print("Serving policy on", server.address)
+
+    stats = await run_local_clients(server)
+    for name, value in stats.items():
+        print(f"{name}: {value:.3f}" if isinstance(value, float) else f"{name}: {value}")
+    await server.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
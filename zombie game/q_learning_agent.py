@@ -1,8 +1,12 @@
 import numpy as np
 import random
+import heapq
+from collections import deque
 
 class QLearningAgent:
-    def __init__(self, state_size, action_size, learning_rate=0.2, discount_factor=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995):
+    def __init__(self, state_size, action_size, learning_rate=0.2, discount_factor=0.99, epsilon=1.0, epsilon_min=0.01, epsilon_decay=0.995,
+                 planning_steps=0, priority_threshold=1e-4, n_step=1, trace_decay=0.0, trace_min=1e-3,
+                 epsilon_decay_per='step'):
         self.state_size = state_size
         self.action_size = action_size
         self.learning_rate = learning_rate
@@ -10,11 +14,38 @@ class QLearningAgent:
         self.epsilon = epsilon
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
+        if epsilon_decay_per not in ('step', 'episode'):
+            raise ValueError("epsilon_decay_per must be 'step' or 'episode'")
+        self.epsilon_decay_per = epsilon_decay_per
         
         # Initialize Q-table as a dictionary
         self.q_table = {}
+        
+        # Prioritized sweeping (model-based planning), disabled when planning_steps is 0
+        self.planning_steps = planning_steps
+        self.priority_threshold = priority_threshold
+        self.model = {}  # (state_key, action) -> (reward, next_state_key, done)
+        self.predecessors = {}  # state_key -> set of (state_key, action) leading to it
+        self.priority_queue = []  # heap of (-priority, state_key, action), may hold stale entries
+        self.priorities = {}  # (state_key, action) -> priority of its live heap entry
+        
+        # Multi-step credit assignment: n-step returns or Watkins Q(lambda)
+        if n_step > 1 and trace_decay > 0:
+            raise ValueError("n_step and trace_decay are alternative modes, set only one")
+        self.n_step = n_step
+        self.trace_decay = trace_decay
+        self.trace_min = trace_min
+        self.n_step_buffer = deque()  # pending (state_key, action, reward) of the current episode
+        self.last_next_state_key = None
+        self.traces = {}  # (state_key, action) -> eligibility, only for active traces
+        
+        # Greedy actions of updated states, kept incrementally for convergence checks
+        self.greedy_actions = {}
+        self.new_states = set()  # first updated since the last policy checkpoint
+        self.changed_states = set()  # greedy action flipped since the last policy checkpoint
     
-    def _get_state_key(self, state):
+    @staticmethod
+    def _get_state_key(state):
         # Find player position
         player_pos = None
         zombie_positions = []
@@ -72,30 +103,172 @@ class QLearningAgent:
         
         return np.argmax(self.q_table[state_key])
     
+    def _q_values(self, state_key):
+        # Initialize Q-values if state not in Q-table
+        if state_key not in self.q_table:
+            self.q_table[state_key] = np.zeros(self.action_size)
+        return self.q_table[state_key]
+    
+    def _td_error(self, state_key, action, reward, next_state_key, done):
+        if done:
+            target = reward
+        else:
+            target = reward + self.discount_factor * np.max(self._q_values(next_state_key))
+        return target - self._q_values(state_key)[action]
+    
+    def _update(self, state_key, action, reward, next_state_key, done):
+        # Q-learning update rule
+        td_error = self._td_error(state_key, action, reward, next_state_key, done)
+        self.q_table[state_key][action] += self.learning_rate * td_error
+        self._track_greedy(state_key)
+        return td_error
+    
     def learn(self, state, action, reward, next_state, done):
         state_key = self._get_state_key(state)
         next_state_key = self._get_state_key(next_state)
         
-        # Initialize Q-values if states not in Q-table
-        if state_key not in self.q_table:
-            self.q_table[state_key] = np.zeros(self.action_size)
-        if next_state_key not in self.q_table:
-            self.q_table[next_state_key] = np.zeros(self.action_size)
-        
-        # Q-learning update rule
-        current_q = self.q_table[state_key][action]
-        if done:
-            next_q = reward
+        if self.trace_decay > 0:
+            td_error = self._learn_traces(state_key, action, reward, next_state_key, done)
+        elif self.n_step > 1:
+            # One-step residual is still reported for convergence tracking
+            td_error = self._td_error(state_key, action, reward, next_state_key, done)
+            self._learn_n_step(state_key, action, reward, next_state_key, done)
         else:
-            next_q = reward + self.discount_factor * np.max(self.q_table[next_state_key])
+            td_error = self._update(state_key, action, reward, next_state_key, done)
         
-        # Update Q-value
-        self.q_table[state_key][action] = current_q + self.learning_rate * (next_q - current_q)
+        if self.planning_steps > 0:
+            self._remember(state_key, action, reward, next_state_key, done, td_error)
+            self._plan()
         
-        # Decay epsilon
+        if self.epsilon_decay_per == 'step':
+            self.decay_epsilon()
+        
+        return td_error
+    
+    def decay_epsilon(self):
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
     
+    def _learn_n_step(self, state_key, action, reward, next_state_key, done):
+        # As in Watkins Q(lambda), returns stop at an exploratory action and bootstrap from its state
+        q_values = self._q_values(state_key)
+        if q_values[action] < np.max(q_values):
+            while self.n_step_buffer:
+                self._n_step_update(state_key, False)
+        
+        self.n_step_buffer.append((state_key, action, reward))
+        self.last_next_state_key = next_state_key
+        if done:
+            while self.n_step_buffer:
+                self._n_step_update(next_state_key, True)
+        elif len(self.n_step_buffer) == self.n_step:
+            self._n_step_update(next_state_key, False)
+    
+    def _n_step_update(self, bootstrap_key, done):
+        # Discounted sum of the buffered rewards, bootstrapped from bootstrap_key unless terminal
+        n_step_return = 0.0
+        for i, (_, _, reward) in enumerate(self.n_step_buffer):
+            n_step_return += (self.discount_factor ** i) * reward
+        if not done:
+            n_step_return += (self.discount_factor ** len(self.n_step_buffer)) * np.max(self._q_values(bootstrap_key))
+        
+        state_key, action, _ = self.n_step_buffer.popleft()
+        q_values = self._q_values(state_key)
+        q_values[action] += self.learning_rate * (n_step_return - q_values[action])
+        self._track_greedy(state_key)
+    
+    def _learn_traces(self, state_key, action, reward, next_state_key, done):
+        # Watkins Q(lambda): an exploratory action cuts the traces of everything before it
+        q_values = self._q_values(state_key)
+        if q_values[action] < np.max(q_values):
+            self.traces.clear()
+        
+        td_error = self._td_error(state_key, action, reward, next_state_key, done)
+        self.traces[(state_key, action)] = 1.0  # Replacing traces
+        
+        # Only active traces are updated and decayed; tiny ones are dropped
+        decay = self.discount_factor * self.trace_decay
+        active_traces = {}
+        for (trace_key, trace_action), trace in self.traces.items():
+            self.q_table[trace_key][trace_action] += self.learning_rate * td_error * trace
+            self._track_greedy(trace_key)
+            trace *= decay
+            if trace >= self.trace_min:
+                active_traces[(trace_key, trace_action)] = trace
+        self.traces = active_traces if not done else {}
+        return td_error
+    
+    def end_episode(self):
+        # Episodes cut off by a step limit still bootstrap from the last observed state
+        while self.n_step_buffer:
+            self._n_step_update(self.last_next_state_key, False)
+        self.traces = {}
+        
+        if self.epsilon_decay_per == 'episode':
+            self.decay_epsilon()
+    
+    def _remember(self, state_key, action, reward, next_state_key, done, td_error):
+        # The environment is deterministic, so the last observed outcome is the model
+        previous = self.model.get((state_key, action))
+        if previous is not None and previous[1] != next_state_key:
+            self.predecessors[previous[1]].discard((state_key, action))
+        self.model[(state_key, action)] = (reward, next_state_key, done)
+        self.predecessors.setdefault(next_state_key, set()).add((state_key, action))
+        
+        # Prioritized by the error observed before the real update, as in standard prioritized sweeping
+        self._push(state_key, action, td_error)
+    
+    def _push(self, state_key, action, td_error):
+        # One live entry per (state, action); only a higher priority replaces it
+        priority = abs(td_error)
+        if priority <= self.priority_threshold or priority <= self.priorities.get((state_key, action), 0.0):
+            return
+        self.priorities[(state_key, action)] = priority
+        heapq.heappush(self.priority_queue, (-priority, state_key, action))
+        
+        # Drop superseded entries once they outnumber the live ones
+        if len(self.priority_queue) > 2 * len(self.priorities) + 64:
+            self.priority_queue = [(-p, key, a) for (key, a), p in self.priorities.items()]
+            heapq.heapify(self.priority_queue)
+    
+    def _plan(self):
+        # Prioritized sweeping: replay the transitions with the largest Bellman error first
+        updates = 0
+        while updates < self.planning_steps and self.priority_queue:
+            neg_priority, state_key, action = heapq.heappop(self.priority_queue)
+            if self.priorities.get((state_key, action)) != -neg_priority:
+                continue  # Stale entry superseded by a higher priority
+            del self.priorities[(state_key, action)]
+            updates += 1
+            reward, next_state_key, done = self.model[(state_key, action)]
+            self._update(state_key, action, reward, next_state_key, done)
+            
+            # A partial step (learning_rate < 1) leaves part of the error behind
+            self._push(state_key, action, self._td_error(state_key, action, reward, next_state_key, done))
+            
+            # Anything leading into state_key may now have a stale value
+            for pred_key, pred_action in self.predecessors.get(state_key, ()):
+                pred_reward, _, pred_done = self.model[(pred_key, pred_action)]
+                td_error = self._td_error(pred_key, pred_action, pred_reward, state_key, pred_done)
+                self._push(pred_key, pred_action, td_error)
+    
+    def _track_greedy(self, state_key):
+        action = int(np.argmax(self.q_table[state_key]))
+        previous = self.greedy_actions.get(state_key)
+        if previous is None:
+            self.new_states.add(state_key)
+        elif previous != action and state_key not in self.new_states:
+            self.changed_states.add(state_key)
+        self.greedy_actions[state_key] = action
+    
+    def take_policy_changes(self):
+        # Flipped states out of those already updated before the last checkpoint, then start a new one
+        compared = len(self.greedy_actions) - len(self.new_states)
+        changed = len(self.changed_states)
+        self.new_states = set()
+        self.changed_states = set()
+        return changed, compared
+    
     def save_q_table(self, filename='q_table.npy'):
         np.save(filename, dict(self.q_table))
     
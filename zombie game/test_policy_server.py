@@ -0,0 +1,130 @@
+import asyncio
+import json
+import numpy as np
+import pytest
+from q_learning_agent import QLearningAgent
+from policy_server import PolicyServer, connect_local, export_policy, run_local_clients
+
+def observation(position):
+    # Player on the top row with a revealed exit, one distinct state key per position
+    state = np.zeros((8, 8, 6))
+    state[0, position, 0] = 1
+    state[0, 7, 4] = 1
+    return state
+
+@pytest.fixture
+def policy_files(tmp_path):
+    rng = np.random.default_rng(0)
+    q_table = {QLearningAgent._get_state_key(observation(p)): rng.normal(size=5) for p in range(7)}
+    for i in range(50):
+        q_table[f"state-{i}"] = rng.normal(size=5)
+    values_file, keys_file = export_policy(q_table, tmp_path / 'values.npy', tmp_path / 'keys.npy')
+    return str(values_file), str(keys_file)
+
+@pytest.fixture(params=['tcp', 'unix'])
+def serve(request, tmp_path, policy_files):
+    # Runs a coroutine against a started server on the requested transport
+    def run(check, **server_kwargs):
+        async def main():
+            server = PolicyServer(*policy_files, **server_kwargs)
+            if request.param == 'unix':
+                await server.start(path=str(tmp_path / 'policy.sock'))
+            else:
+                await server.start()
+            try:
+                await check(server)
+            finally:
+                await server.close()
+        asyncio.run(main())
+    return run
+
+def test_batched_actions_match_argmax(serve):
+    async def check(server):
+        expected = np.argmax(np.asarray(server.q_values), axis=1)
+
+        async def session():
+            client = await connect_local(server)
+            actions = [await client.act(state_id=i) for i in range(len(expected))]
+            await client.close()
+            return actions
+
+        results = await asyncio.gather(*(session() for _ in range(8)))
+        for actions in results:
+            assert actions == expected.tolist()
+        assert server.batches < server.requests
+
+    serve(check, max_batch_delay=0.01)
+
+def test_run_local_clients_counts_requests(serve):
+    async def check(server):
+        stats = await run_local_clients(server, clients=4, requests_per_client=10)
+        assert stats["requests"] == 40
+
+    serve(check)
+
+def test_state_key_and_observation_resolve_to_same_id(serve):
+    async def check(server):
+        client = await connect_local(server)
+        for position in range(7):
+            state = observation(position)
+            by_key = await client.request(state_key=QLearningAgent._get_state_key(state))
+            by_observation = await client.request(observation=state.tolist())
+            assert by_key == by_observation
+            assert by_key["state_id"] == position
+        await client.close()
+
+    serve(check)
+
+def test_unknown_state_is_reported(serve):
+    async def check(server):
+        client = await connect_local(server)
+        assert (await client.request(state_key="never seen"))["state_id"] == -1
+        with pytest.raises(LookupError):
+            await client.act(state_key="never seen")
+        await client.close()
+
+    serve(check)
+
+def test_malformed_requests_get_errors_and_keep_connection(serve):
+    async def check(server):
+        client = await connect_local(server)
+        bad_lines = [
+            b"not json\n",
+            b'{"state_id": Infinity}\n',
+            b'{"state_id": true}\n',
+            b'{"state_id": 1.5}\n',
+            b'{"state_id": 1000000}\n',
+            b'{"state_id": -1}\n',
+            b'{"nothing": 1}\n',
+            (json.dumps({"observation": np.zeros((8, 7, 6)).tolist()}) + "\n").encode(),
+            b'{"state_key": "' + b"x" * 100000 + b'"}\n',
+        ]
+        for line in bad_lines:
+            client.writer.write(line)
+            await client.writer.drain()
+            response = json.loads(await client.reader.readline())
+            assert "error" in response
+        with pytest.raises(ValueError):
+            await client.act(observation=np.zeros((8, 7, 6)))
+
+        # The connection is still usable afterwards
+        assert await client.act(state_id=0) == int(np.argmax(server.q_values[0]))
+        await client.close()
+
+    serve(check)
+
+def test_close_fails_pending_requests(serve):
+    async def check(server):
+        client = await connect_local(server)
+        pending_client = asyncio.create_task(client.act(state_id=0))
+        pending_direct = asyncio.create_task(server.act(1))
+        await asyncio.sleep(0.05)
+        await server.close()
+        with pytest.raises(ConnectionError):
+            await pending_direct
+        with pytest.raises(ConnectionError):
+            await pending_client
+        client.writer.close()
+
+    # A long batch window keeps the requests pending until close()
+    serve(check, max_batch_delay=60)
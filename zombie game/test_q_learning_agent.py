@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from q_learning_agent import QLearningAgent
+
+RIGHT = 1
+CHAIN_LENGTH = 5
+GOAL_REWARD = 10.0
+
+def chain_state(position):
+    # Player walks along the top row towards a revealed exit, so every position has its own key
+    state = np.zeros((8, 8, 6))
+    state[0, position, 0] = 1
+    state[0, 7, 4] = 1
+    return state
+
+def make_agent(**kwargs):
+    kwargs.setdefault('learning_rate', 0.2)
+    return QLearningAgent(state_size=(8, 8, 6), action_size=5, discount_factor=0.99, epsilon=0.0, **kwargs)
+
+def run_chain(agent, episodes):
+    # Deterministic chain s0 -> s1 -> ... -> s4, reward only on the final (terminal) transition
+    for _ in range(episodes):
+        for position in range(CHAIN_LENGTH - 1):
+            done = position == CHAIN_LENGTH - 2
+            reward = GOAL_REWARD if done else 0.0
+            agent.learn(chain_state(position), RIGHT, reward, chain_state(position + 1), done)
+        agent.end_episode()
+
+def start_value(agent):
+    return agent.q_table[agent._get_state_key(chain_state(0))][RIGHT]
+
+TRUE_START_VALUE = GOAL_REWARD * 0.99 ** (CHAIN_LENGTH - 2)
+
+@pytest.mark.parametrize('learning_rate', [0.2, 1.0])
+def test_prioritized_sweeping_propagates_to_start_state(learning_rate):
+    agent = make_agent(learning_rate=learning_rate, planning_steps=50)
+    run_chain(agent, episodes=3)
+    assert start_value(agent) == pytest.approx(TRUE_START_VALUE, abs=0.1)
+
+def test_one_step_q_learning_propagates_slowly():
+    agent = make_agent()
+    run_chain(agent, episodes=3)
+    assert start_value(agent) < 0.1 * TRUE_START_VALUE
+
+def test_priority_queue_keeps_one_live_entry_per_pair():
+    agent = make_agent(planning_steps=1)
+    run_chain(agent, episodes=20)
+    assert len(agent.priorities) <= len(agent.model)
+    assert len(agent.priority_queue) <= 2 * len(agent.priorities) + 64
+
+@pytest.mark.parametrize('kwargs', [{'n_step': 4}, {'trace_decay': 0.9}])
+def test_multi_step_modes_reach_start_state_in_one_episode(kwargs):
+    agent = make_agent(**kwargs)
+    run_chain(agent, episodes=1)
+    assert start_value(agent) > 0
@@ -3,7 +3,7 @@ from zombie_env_short import ZombieEnvironment
 from q_learning_agent import QLearningAgent
 import matplotlib.pyplot as plt
 
-def train(episodes=5000):
+def train(episodes=5000, planning_steps=0, n_step=1, trace_decay=0.0, convergence=None, epsilon_decay_per='step'):
     # Create environment and agent
     env = ZombieEnvironment()
     agent = QLearningAgent(
@@ -13,7 +13,11 @@ def train(episodes=5000):
         discount_factor=0.99,
         epsilon=1.0,
         epsilon_min=0.01,
-        epsilon_decay=0.995
+        epsilon_decay=0.995,
+        planning_steps=planning_steps,
+        n_step=n_step,
+        trace_decay=trace_decay,
+        epsilon_decay_per=epsilon_decay_per
     )
     
     # Training statistics
@@ -27,14 +31,17 @@ def train(episodes=5000):
         total_reward = 0
         steps = 0
         done = False
+        truncated = False
         
-        while not done and steps < max_steps_per_episode:
+        while not done and not truncated and steps < max_steps_per_episode:
             # Choose and perform action
             action = agent.choose_action(state)
-            next_state, reward, done, _, info = env.step(action)
+            next_state, reward, done, truncated, info = env.step(action)
             
             # Learn from the action
-            agent.learn(state, action, reward, next_state, done)
+            td_error = agent.learn(state, action, reward, next_state, done)
+            if convergence is not None:
+                convergence.record_update(td_error)
             
             state = next_state
             total_reward += reward
@@ -44,6 +51,10 @@ def train(episodes=5000):
             if episode % 100 == 0:
                 env.render()
         
+        agent.end_episode()
+        if convergence is not None:
+            convergence.record_episode(total_reward > 5000, agent)
+        
         # Record statistics
         rewards_history.append(total_reward)
         steps_history.append(steps)
@@ -60,10 +71,18 @@ def train(episodes=5000):
             print(f"Steps: {steps}")
             print(f"Epsilon: {agent.epsilon:.3f}")
             print(f"Best Reward: {best_reward}")
+            if convergence is not None:
+                print(convergence.summary())
             print("--------------------")
         
+        # With convergence tracking, stop once the configured rules hold
+        if convergence is not None:
+            if convergence.should_stop():
+                print(f"Converged after {episode + 1} episodes!")
+                print(convergence.summary())
+                break
         # If we've achieved a good result, we can stop early
-        if total_reward > 5000:  # Successfully completed the game
+        elif total_reward > 5000:  # Successfully completed the game
             print("Successfully solved the environment!")
             break
     
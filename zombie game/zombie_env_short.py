@@ -6,10 +6,11 @@ import time
 import os
 
 class ZombieEnvironment(gym.Env):
-    def __init__(self, grid_size=8):
+    def __init__(self, grid_size=8, render_mode="human"):
         super(ZombieEnvironment, self).__init__()
         
         self.grid_size = grid_size
+        self.render_mode = render_mode  # None runs headless with no window or delays
         self.window_size = 800
         self.cell_size = (self.window_size - 200) // self.grid_size
         
@@ -25,8 +26,9 @@ class ZombieEnvironment(gym.Env):
         
         # Initialize Pygame
         pygame.init()
-        self.screen = pygame.display.set_mode((self.window_size, self.window_size))
-        pygame.display.set_caption("Castle Warrior RL")
+        if self.render_mode == "human":
+            self.screen = pygame.display.set_mode((self.window_size, self.window_size))
+            pygame.display.set_caption("Castle Warrior RL")
         
         # Initialize fonts
         self.font = pygame.font.Font(None, 24)
@@ -159,7 +161,7 @@ class ZombieEnvironment(gym.Env):
         self.exit_revealed = False
         self.steps = 0
         self.total_reward = 0
-        return self.state, {}
+        return self.state.copy(), {}
     
     def _get_random_position(self):
         return (
@@ -259,17 +261,20 @@ class ZombieEnvironment(gym.Env):
             reward += 5000  # Much bigger completion bonus
             done = True
         
-        # End episode if too many steps
-        if self.steps >= 100:
-            done = True
+        # End episode if too many steps; this is a time limit, not a terminal state
+        truncated = self.steps >= 100 and not done
         
         self.total_reward += reward
-        self.render(info)
-        time.sleep(1.5)  # Even slower for better visualization
+        if self.render_mode == "human":
+            self.render(info)
+            time.sleep(1.5)  # Even slower for better visualization
         
-        return self.state, reward, done, False, info
+        return self.state.copy(), reward, done, truncated, info
     
     def render(self, info=None):
+        if self.render_mode != "human":
+            return
+        
         # Fill background with stone texture
         self.screen.fill(self.COLORS['background'])
         